@@ -6,25 +6,278 @@ Advanced analysis of collected test logs with pattern detection and insights.
 """
 
 import argparse
+import copy
 import json
+import mmap
 import os
 import re
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+# Log files are scanned in blocks of whole lines of about this many bytes
+_READ_BLOCK_SIZE = 1024 * 1024
+
+
+def _list_files(directory: Path) -> Dict[str, Path]:
+    """Map names to paths for the regular files directly inside ``directory``.
+
+    A single scandir pass replaces an exists() probe per expected file; a missing
+    directory yields an empty mapping.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name: Path(entry.path) for entry in entries if entry.is_file()}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+
+def _iter_line_blocks(f: BinaryIO, block_size: int = _READ_BLOCK_SIZE) -> Iterator[bytes]:
+    """Yield a binary file in blocks of whole lines of roughly ``block_size`` bytes.
+
+    Files larger than one block are memory-mapped, so each block is a single slice
+    of the mapping instead of a list of lines joined back together.
+    """
+    size = os.fstat(f.fileno()).st_size
+    if size <= block_size:
+        yield f.read()
+        return
+
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        start = 0
+        while start < size:
+            end = mapped.find(b"\n", start + block_size)
+            end = size if end == -1 else end + 1
+            yield mapped[start:end]
+            start = end
+
+
+def _required_literal(pattern: str) -> bytes:
+    """Return the longest literal run every match of ``pattern`` must contain.
+
+    The result is lowercased for a case-insensitive substring pre-check. An empty
+    literal is returned when none can be derived safely, which disables the check.
+    """
+    if "|" in pattern:
+        return b""
+    # Escapes and character classes never contribute to the literal, and a counted
+    # repetition makes the preceding run optional like ``*`` does
+    stripped = re.sub(r"\{[^}]*\}", "*", re.sub(r"\\.|\[[^\]]*\]", " ", pattern))
+    # Ignore characters made optional by a trailing quantifier
+    runs = re.findall(r"[A-Za-z0-9]+(?![?*{])", stripped)
+    return max(runs, key=len, default="").lower().encode()
+
+
+_REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+
+def _lowercase_pattern(pattern: str) -> str:
+    """Lowercase the literal text of ``pattern``, leaving escapes such as ``\\b`` intact."""
+    return re.sub(r"\\.|[^\\]+", lambda m: m.group() if m.group().startswith("\\") else m.group().lower(), pattern)
+
+
+# Gaps between anchors are bounded to 200 characters of the same line: an
+# unbounded gap, greedy or lazy, is retried to the end of the line from every
+# occurrence of the first anchor, which is quadratic on long lines without a match
+_BOUNDED_GAP = r"[^\n]{0,200}"
+
+
+class _PatternSet:
+    """Compiled regexes of one pattern type, matched together against a log.
+
+    Patterns are lowercased and compiled without re.IGNORECASE; they run against
+    log content lowercased once per block, which keeps case folding out of the
+    regex engine. Patterns sharing a leading character are also merged into one
+    alternation so a single scan can rule out the whole group before each member
+    is counted.
+
+    Entries are pattern strings, or ``(pattern, terminal)`` pairs built by _terminal.
+    The strings as written become the labels; ``.*`` gaps are compiled as _BOUNDED_GAP.
+    """
+
+    def __init__(self, entries: List[Union[str, Tuple[str, bool]]]):
+        entries = [(entry, False) if isinstance(entry, str) else entry for entry in entries]
+        self.labels = [label for label, _ in entries]
+        patterns = [label.replace(".*", _BOUNDED_GAP) for label in self.labels]
+        self.terminal = [terminal for _, terminal in entries]
+        self.literals = [_required_literal(pattern) for pattern in patterns]
+        self.regexes = [re.compile(_lowercase_pattern(pattern).encode()) for pattern in patterns]
+        self.terminal_regexes = [regex for regex, terminal in zip(self.regexes, self.terminal) if terminal]
+        # Patterns without metacharacters are counted with bytes.count, which runs
+        # entirely in C instead of yielding a match object per hit
+        self.plain_literals = [
+            None if _REGEX_METACHARACTERS.intersection(pattern) else pattern.lower().encode() for pattern in patterns
+        ]
+
+        by_leading_char = defaultdict(list)
+        for index, pattern in enumerate(patterns):
+            by_leading_char[pattern[:1].lower()].append(index)
+
+        self.groups = []
+        for indices in by_leading_char.values():
+            combined = b"|".join(b"(?:%s)" % self.regexes[index].pattern for index in indices)
+            self.groups.append((re.compile(combined), indices))
+
+    def count(self, content_lower: bytes, present_literals: Set[bytes]) -> List[int]:
+        """Return the number of matches of each pattern, in declaration order.
+
+        ``content_lower`` must already be lowercased. Only patterns whose required
+        literal is in ``present_literals`` are run.
+        """
+        counts = [0] * len(self.regexes)
+        for combined, indices in self.groups:
+            candidates = [index for index in indices if self.literals[index] in present_literals]
+            if not candidates:
+                continue
+            if len(candidates) > 1 and not combined.search(content_lower):
+                continue
+            for index in candidates:
+                plain_literal = self.plain_literals[index]
+                if plain_literal is not None:
+                    counts[index] = content_lower.count(plain_literal)
+                else:
+                    # Only the count is needed, so avoid materializing every match
+                    counts[index] = sum(1 for _ in self.regexes[index].finditer(content_lower))
+        return counts
+
+
+def _terminal(pattern: str) -> Tuple[str, bool]:
+    """Mark ``pattern`` as severe enough that, with stop_on_fatal, the rest of a log is not scanned once it appears."""
+    return pattern, True
+
+
+def _compile_all(patterns: Dict[str, List[Union[str, Tuple[str, bool]]]]) -> Dict[str, _PatternSet]:
+    """Compile a pattern-type -> regex list mapping once at import time.
+
+    Patterns are compiled as bytes so log files can be matched without decoding.
+    """
+    return {pattern_type: _PatternSet(pattern_list) for pattern_type, pattern_list in patterns.items()}
+
+
+# Log patterns per category, compiled once instead of on every analysis call.
+# Each ``.*`` gap is compiled as _BOUNDED_GAP; the patterns as written serve as
+# the labels shown in reports.
+_PATTERNS = {
+    "container": _compile_all(
+        {
+            "startup_patterns": [
+                r"macOS.*boot",
+                r"System.*ready",
+                r"login.*window",
+                r"display.*manager",
+            ],
+            "error_patterns": [
+                _terminal(r"kernel.*panic"),
+                r"segmentation.*fault",
+                _terminal(r"panic:"),
+                r"fatal.*error",
+                r"core.*dump",
+            ],
+            "performance_patterns": [
+                r"CPU.*usage",
+                r"memory.*pressure",
+                r"disk.*I/O",
+                r"network.*timeout",
+            ],
+        }
+    ),
+    "docker": _compile_all(
+        {
+            "startup_patterns": [
+                r"Creating.*macos",
+                r"Starting.*macos",
+                r"Container.*healthy",
+            ],
+            "error_patterns": [
+                r"failed.*start",
+                r"port.*already.*allocated",
+                r"network.*error",
+                r"permission.*denied",
+            ],
+            "warning_patterns": [r"deprecated", r"warning", r"restart.*policy"],
+        }
+    ),
+    "molecule": _compile_all(
+        {
+            "success_patterns": [
+                r"PLAY RECAP.*\bfailed=0\b",
+                r"converge.*completed",
+                r"verify.*completed",
+                r"Test.*successful",
+            ],
+            "failure_patterns": [
+                r"PLAY RECAP.*\bfailed=[1-9]",
+                r"TASK.*failed",
+                r"fatal.*failed",
+                r"FAILED! =>",
+                r"AssertionError",
+            ],
+            "performance_patterns": [
+                r"elapsed.*time",
+                r"task.*duration",
+                r"playbook.*execution",
+            ],
+        }
+    ),
+    "tailscale_service": _compile_all(
+        {
+            "error_patterns": [
+                r"error",
+                r"failed.*connect",
+                r"authentication.*failed",
+                r"network.*unreachable",
+            ],
+            "info_patterns": [
+                r"starting.*tailscaled",
+                r"connected.*to.*control",
+                r"route.*added",
+                r"dns.*configured",
+            ],
+        }
+    ),
+}
+
+_IP_ADDRESS_RE = re.compile(rb"\d+\.\d+\.\d+\.\d+")
+_MEMORY_USAGE_RE = re.compile(rb"Memory usage:\s*(.+)")
+_DISK_USAGE_RE = re.compile(rb"Disk usage:\s*(.+)")
+
+# Common timestamp formats, matched in one pass and parsed by the branch that matched
+_TIMESTAMP_RE = re.compile(
+    rb"(?P<iso>\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})|(?P<us>\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2})"
+)
+_TIMESTAMP_PARSERS = {
+    "iso": datetime.fromisoformat,
+    "us": lambda value: datetime.strptime(value, "%m/%d/%Y %H:%M:%S"),
+}
 
 
 class LogAnalyzer:
     """Advanced log analyzer for macOS test results."""
 
-    def __init__(self, log_dir: str, output_dir: str):
+    def __init__(self, log_dir: str, output_dir: str, collect_timeline: bool = False, stop_on_fatal: bool = False):
         self.log_dir = Path(log_dir)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Analysis results
+        # The timeline holds one event per timestamped log line and is only
+        # written to the JSON results, so it is built on request
+        self._collect_timeline = collect_timeline
+
+        # Stop scanning a log at the first block containing a terminal pattern;
+        # counts for that log then become lower bounds
+        self._stop_on_fatal = stop_on_fatal
+
+        # Analysis results. Events are recorded as plain tuples while logs are
+        # scanned and only turned into report dicts once analysis is complete.
+        self._raw_issues = []
+        self._raw_insights = []
+        self._raw_timeline = []
+        self._issue_counts_by_category = Counter()
+        self._issue_counts_by_severity = Counter()
+        self._analyzed_at = None
         self.issues = []
         self.insights = []
         self.metrics = {}
@@ -33,6 +286,7 @@ class LogAnalyzer:
     def analyze_all_logs(self) -> Dict:
         """Perform comprehensive analysis of all logs."""
         print(f"🔍 Analyzing logs in {self.log_dir}")
+        self._analyzed_at = datetime.now().isoformat()
 
         analysis_results = {
             "summary": {},
@@ -43,16 +297,26 @@ class LogAnalyzer:
             "recommendations": [],
         }
 
-        # Analyze different log categories
-        self._analyze_container_logs()
-        self._analyze_docker_logs()
-        self._analyze_molecule_logs()
-        self._analyze_tailscale_logs()
-        self._analyze_system_logs()
+        # Analyze different log categories. They read disjoint directories, so each
+        # runs concurrently on its own worker and results are merged in this order
+        analyzers = [
+            LogAnalyzer._analyze_container_logs,
+            LogAnalyzer._analyze_docker_logs,
+            LogAnalyzer._analyze_molecule_logs,
+            LogAnalyzer._analyze_tailscale_logs,
+            LogAnalyzer._analyze_system_logs,
+        ]
+        workers = [self._fork() for _ in analyzers]
+        with ThreadPoolExecutor(max_workers=len(analyzers)) as executor:
+            futures = [executor.submit(analyze, worker) for analyze, worker in zip(analyzers, workers)]
+            for future, worker in zip(futures, workers):
+                future.result()
+                self._merge(worker)
 
         # Generate overall analysis
         self._generate_summary()
         self._generate_recommendations()
+        self._materialize_results()
 
         # Compile results
         analysis_results.update(
@@ -70,185 +334,174 @@ class LogAnalyzer:
 
         return analysis_results
 
+    def _fork(self) -> "LogAnalyzer":
+        """Return an analyzer sharing this configuration but with empty results."""
+        worker = copy.copy(self)
+        worker._raw_issues = []
+        worker._raw_insights = []
+        worker._raw_timeline = []
+        worker._issue_counts_by_category = Counter()
+        worker._issue_counts_by_severity = Counter()
+        worker.metrics = {}
+        return worker
+
+    def _merge(self, worker: "LogAnalyzer"):
+        """Append the results collected by a forked worker."""
+        self._raw_issues.extend(worker._raw_issues)
+        self._raw_insights.extend(worker._raw_insights)
+        self._raw_timeline.extend(worker._raw_timeline)
+        self._issue_counts_by_category.update(worker._issue_counts_by_category)
+        self._issue_counts_by_severity.update(worker._issue_counts_by_severity)
+        self.metrics.update(worker.metrics)
+
     def _analyze_container_logs(self):
         """Analyze container-specific logs."""
-        container_dir = self.log_dir / "container"
-        if not container_dir.exists():
-            return
+        files = _list_files(self.log_dir / "container")
 
         # Analyze recent container logs
-        recent_log = container_dir / "container-recent.log"
-        if recent_log.exists():
-            self._analyze_log_file(
-                recent_log,
-                "container",
-                {
-                    "startup_patterns": [r"macOS.*boot", r"System.*ready", r"login.*window", r"display.*manager"],
-                    "error_patterns": [
-                        r"kernel.*panic",
-                        r"segmentation.*fault",
-                        r"panic:",
-                        r"fatal.*error",
-                        r"core.*dump",
-                    ],
-                    "performance_patterns": [r"CPU.*usage", r"memory.*pressure", r"disk.*I/O", r"network.*timeout"],
-                },
-            )
+        recent_log = files.get("container-recent.log")
+        if recent_log:
+            self._analyze_log_file(recent_log, "container", _PATTERNS["container"])
 
         # Analyze container inspection data
-        inspect_file = container_dir / "container-inspect.json"
-        if inspect_file.exists():
+        inspect_file = files.get("container-inspect.json")
+        if inspect_file:
             try:
-                with open(inspect_file, "r") as f:
-                    inspect_data = json.load(f)
-                    self._analyze_container_inspection(inspect_data)
+                inspect_data = json.loads(inspect_file.read_bytes())
+                self._analyze_container_inspection(inspect_data)
             except json.JSONDecodeError:
                 self._add_issue("container", "Invalid JSON in container inspection", "error")
 
     def _analyze_docker_logs(self):
         """Analyze Docker and Docker Compose logs."""
-        docker_dir = self.log_dir / "docker"
-        if not docker_dir.exists():
-            return
-
-        compose_log = docker_dir / "docker-compose.log"
-        if compose_log.exists():
-            self._analyze_log_file(
-                compose_log,
-                "docker",
-                {
-                    "startup_patterns": [r"Creating.*macos", r"Starting.*macos", r"Container.*healthy"],
-                    "error_patterns": [
-                        r"failed.*start",
-                        r"port.*already.*allocated",
-                        r"network.*error",
-                        r"permission.*denied",
-                    ],
-                    "warning_patterns": [r"deprecated", r"warning", r"restart.*policy"],
-                },
-            )
+        files = _list_files(self.log_dir / "docker")
+
+        compose_log = files.get("docker-compose.log")
+        if compose_log:
+            self._analyze_log_file(compose_log, "docker", _PATTERNS["docker"])
 
     def _analyze_molecule_logs(self):
         """Analyze Molecule test execution logs."""
-        molecule_dir = self.log_dir / "molecule"
-        if not molecule_dir.exists():
-            return
+        files = _list_files(self.log_dir / "molecule")
 
-        for log_file in molecule_dir.glob("*.log"):
+        for name, log_file in files.items():
+            if not name.endswith(".log"):
+                continue
             scenario_name = log_file.stem.replace("-", "_")
-            self._analyze_log_file(
-                log_file,
-                f"molecule_{scenario_name}",
-                {
-                    "success_patterns": [
-                        r"PLAY RECAP.*ok=.*changed=.*unreachable=.*failed=0",
-                        r"converge.*completed",
-                        r"verify.*completed",
-                        r"Test.*successful",
-                    ],
-                    "failure_patterns": [
-                        r"PLAY RECAP.*failed=[1-9]",
-                        r"TASK.*failed",
-                        r"fatal.*failed",
-                        r"FAILED! =>",
-                        r"AssertionError",
-                    ],
-                    "performance_patterns": [r"elapsed.*time", r"task.*duration", r"playbook.*execution"],
-                },
-            )
+            self._analyze_log_file(log_file, f"molecule_{scenario_name}", _PATTERNS["molecule"])
 
     def _analyze_tailscale_logs(self):
         """Analyze Tailscale-specific logs and status."""
-        tailscale_dir = self.log_dir / "tailscale"
-        if not tailscale_dir.exists():
-            return
+        files = _list_files(self.log_dir / "tailscale")
 
         # Analyze status files
-        status_file = tailscale_dir / "tailscale-status.txt"
-        if status_file.exists():
+        status_file = files.get("tailscale-status.txt")
+        if status_file:
             self._analyze_tailscale_status(status_file)
 
         # Analyze JSON status
-        status_json = tailscale_dir / "tailscale-status.json"
-        if status_json.exists():
+        status_json = files.get("tailscale-status.json")
+        if status_json:
             try:
-                with open(status_json, "r") as f:
-                    status_data = json.load(f)
-                    self._analyze_tailscale_json_status(status_data)
+                status_data = json.loads(status_json.read_bytes())
+                self._analyze_tailscale_json_status(status_data)
             except json.JSONDecodeError:
                 self._add_issue("tailscale", "Invalid JSON in Tailscale status", "error")
 
         # Analyze service logs
-        journal_log = tailscale_dir / "tailscaled-journal.log"
-        if journal_log.exists():
-            self._analyze_log_file(
-                journal_log,
-                "tailscale_service",
-                {
-                    "error_patterns": [
-                        r"error",
-                        r"failed.*connect",
-                        r"authentication.*failed",
-                        r"network.*unreachable",
-                    ],
-                    "info_patterns": [
-                        r"starting.*tailscaled",
-                        r"connected.*to.*control",
-                        r"route.*added",
-                        r"dns.*configured",
-                    ],
-                },
-            )
+        journal_log = files.get("tailscaled-journal.log")
+        if journal_log:
+            self._analyze_log_file(journal_log, "tailscale_service", _PATTERNS["tailscale_service"])
 
     def _analyze_system_logs(self):
         """Analyze system-level logs and diagnostics."""
-        system_dir = self.log_dir / "system"
-        if not system_dir.exists():
-            return
+        files = _list_files(self.log_dir / "system")
 
-        host_info = system_dir / "host-system-info.txt"
-        if host_info.exists():
+        host_info = files.get("host-system-info.txt")
+        if host_info:
             self._analyze_system_info(host_info, "host")
 
-        container_info = system_dir / "container-system-info.txt"
-        if container_info.exists():
+        container_info = files.get("container-system-info.txt")
+        if container_info:
             self._analyze_system_info(container_info, "container")
 
-    def _analyze_log_file(self, log_file: Path, category: str, patterns: Dict[str, List[str]]):
+    def _analyze_log_file(self, log_file: Path, category: str, patterns: Dict[str, _PatternSet]):
         """Analyze a single log file for patterns."""
         try:
-            with open(log_file, "r", encoding="utf-8", errors="ignore") as f:
-                content = f.read()
-
-            # Count lines and calculate basic metrics
-            lines = content.split("\n")
-            total_lines = len(lines)
+            total_lines = 1
             error_count = 0
             warning_count = 0
+            counts = {pattern_type: [0] * len(pattern_set.labels) for pattern_type, pattern_set in patterns.items()}
+            timestamps = []
+            literals = {literal for pattern_set in patterns.values() for literal in pattern_set.literals}
+            terminal_regexes = []
+            if self._stop_on_fatal:
+                terminal_regexes = [
+                    regex for pattern_set in patterns.values() for regex in pattern_set.terminal_regexes
+                ]
+            stopped_early = False
+
+            # Patterns never span lines, so the file is scanned in blocks of whole
+            # lines to keep memory bounded regardless of log size
+            with open(log_file, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                scanned = 0
+                for block in _iter_line_blocks(f):
+                    # Fold case once per block. Each distinct literal is then looked up
+                    # once for the whole category; substring checks are far cheaper
+                    # than running the regex engine
+                    block_lower = block.lower()
+
+                    # Scan no further than the end of the first line with a terminal pattern
+                    matches = (regex.search(block_lower) for regex in terminal_regexes)
+                    fatal_at = min((match.start() for match in matches if match), default=None)
+                    if fatal_at is not None:
+                        line_end = block_lower.find(b"\n", fatal_at)
+                        if line_end != -1:
+                            block = block[: line_end + 1]
+                            block_lower = block_lower[: line_end + 1]
+                    scanned += len(block)
+                    total_lines += block.count(b"\n")
+
+                    present_literals = {literal for literal in literals if literal in block_lower}
+
+                    for pattern_type, pattern_set in patterns.items():
+                        totals = counts[pattern_type]
+                        for index, count in enumerate(pattern_set.count(block_lower, present_literals)):
+                            totals[index] += count
+
+                    if self._collect_timeline:
+                        timestamps.extend(self._extract_timestamps(block))
+
+                    if fatal_at is not None:
+                        # Counts are only lower bounds if part of the log was left unread
+                        stopped_early = scanned < size
+                        break
 
             # Apply pattern matching
-            for pattern_type, pattern_list in patterns.items():
-                for pattern in pattern_list:
-                    matches = re.findall(pattern, content, re.IGNORECASE)
-                    if matches:
+            for pattern_type, pattern_set in patterns.items():
+                for label, count in zip(pattern_set.labels, counts[pattern_type]):
+                    if count:
+                        found = f"at least {count}" if stopped_early else count
                         if "error" in pattern_type:
-                            error_count += len(matches)
-                            self._add_issue(category, f"Pattern '{pattern}' found {len(matches)} times", "error")
+                            error_count += count
+                            self._add_issue(category, f"Pattern '{label}' found {found} times", "error")
                         elif "warning" in pattern_type:
-                            warning_count += len(matches)
-                            self._add_issue(category, f"Pattern '{pattern}' found {len(matches)} times", "warning")
+                            warning_count += count
+                            self._add_issue(category, f"Pattern '{label}' found {found} times", "warning")
                         elif "success" in pattern_type:
-                            self._add_insight(category, f"Success pattern '{pattern}' found {len(matches)} times")
+                            self._add_insight(category, f"Success pattern '{label}' found {found} times")
 
             # Extract timestamps for timeline
-            timestamps = self._extract_timestamps(content)
-            for timestamp in timestamps:
+            for timestamp in sorted(timestamps):
                 self._add_timeline_event(category, timestamp, "Log entry")
 
             # Store metrics
             self.metrics[f"{category}_lines"] = total_lines
             self.metrics[f"{category}_errors"] = error_count
             self.metrics[f"{category}_warnings"] = warning_count
+            if stopped_early:
+                self.metrics[f"{category}_stopped_early"] = True
 
         except Exception as e:
             self._add_issue(category, f"Failed to analyze log file {log_file}: {str(e)}", "error")
@@ -284,19 +537,19 @@ class LogAnalyzer:
     def _analyze_tailscale_status(self, status_file: Path):
         """Analyze Tailscale status text file."""
         try:
-            with open(status_file, "r") as f:
+            with open(status_file, "rb") as f:
                 content = f.read()
 
             # Check connection status
-            if "Logged out" in content:
+            if b"Logged out" in content:
                 self._add_issue("tailscale", "Tailscale is logged out", "error")
-            elif "Tailscale is stopped" in content:
+            elif b"Tailscale is stopped" in content:
                 self._add_issue("tailscale", "Tailscale service is stopped", "error")
-            elif "Connected to" in content:
+            elif b"Connected to" in content:
                 self._add_insight("tailscale", "Tailscale is connected and running")
 
             # Extract peer information
-            peer_count = len(re.findall(r"\d+\.\d+\.\d+\.\d+", content))
+            peer_count = sum(1 for _ in _IP_ADDRESS_RE.finditer(content))
             self.metrics["tailscale_peer_count"] = peer_count
 
         except Exception as e:
@@ -333,83 +586,85 @@ class LogAnalyzer:
     def _analyze_system_info(self, info_file: Path, system_type: str):
         """Analyze system information file."""
         try:
-            with open(info_file, "r") as f:
+            with open(info_file, "rb") as f:
                 content = f.read()
 
             # Extract resource information
-            if "Memory usage:" in content:
-                memory_match = re.search(r"Memory usage:\s*(.+)", content)
+            if b"Memory usage:" in content:
+                memory_match = _MEMORY_USAGE_RE.search(content)
                 if memory_match:
-                    self.metrics[f"{system_type}_memory_info"] = memory_match.group(1).strip()
+                    memory_info = memory_match.group(1).strip().decode("utf-8", "replace")
+                    self.metrics[f"{system_type}_memory_info"] = memory_info
 
-            if "Disk usage:" in content:
-                disk_match = re.search(r"Disk usage:\s*(.+)", content)
+            if b"Disk usage:" in content:
+                disk_match = _DISK_USAGE_RE.search(content)
                 if disk_match:
-                    self.metrics[f"{system_type}_disk_info"] = disk_match.group(1).strip()
+                    disk_info = disk_match.group(1).strip().decode("utf-8", "replace")
+                    self.metrics[f"{system_type}_disk_info"] = disk_info
 
             # Check for common issues
-            if "No space left" in content:
+            if b"No space left" in content:
                 self._add_issue(system_type, "Disk space full or insufficient", "error")
-            elif "Cannot allocate memory" in content:
+            elif b"Cannot allocate memory" in content:
                 self._add_issue(system_type, "Memory allocation issues", "error")
 
         except Exception as e:
             self._add_issue(system_type, f"Failed to analyze system info: {str(e)}", "error")
 
-    def _extract_timestamps(self, content: str) -> List[datetime]:
-        """Extract timestamps from log content."""
+    def _extract_timestamps(self, content: bytes) -> List[datetime]:
+        """Extract timestamps from log content, in order of appearance."""
         timestamps = []
 
-        # Common timestamp patterns
-        patterns = [
-            r"(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})",
-            r"(\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2})",
-            r"(\w{3} \d{2} \d{2}:\d{2}:\d{2})",
-        ]
+        for match in _TIMESTAMP_RE.finditer(content):
+            try:
+                timestamps.append(_TIMESTAMP_PARSERS[match.lastgroup](match.group().decode("ascii")))
+            except ValueError:
+                # Skip out-of-range values such as month 13
+                continue
 
-        for pattern in patterns:
-            matches = re.findall(pattern, content)
-            for match in matches:
-                try:
-                    # Try to parse timestamp
-                    timestamp = datetime.strptime(match, "%Y-%m-%d %H:%M:%S")
-                    timestamps.append(timestamp)
-                except ValueError:
-                    try:
-                        timestamp = datetime.strptime(match, "%Y-%m-%dT%H:%M:%S")
-                        timestamps.append(timestamp)
-                    except ValueError:
-                        # Skip unparsable timestamps
-                        continue
-
-        return sorted(timestamps)
+        return timestamps
 
     def _add_issue(self, category: str, message: str, severity: str):
         """Add an issue to the analysis results."""
-        self.issues.append(
-            {"category": category, "message": message, "severity": severity, "timestamp": datetime.now().isoformat()}
-        )
+        self._raw_issues.append((category, message, severity))
+        self._issue_counts_by_category[category] += 1
+        self._issue_counts_by_severity[severity] += 1
 
     def _add_insight(self, category: str, message: str):
         """Add an insight to the analysis results."""
-        self.insights.append({"category": category, "message": message, "timestamp": datetime.now().isoformat()})
+        self._raw_insights.append((category, message))
 
     def _add_timeline_event(self, category: str, timestamp: datetime, event: str):
         """Add an event to the timeline."""
-        self.timeline.append({"category": category, "timestamp": timestamp.isoformat(), "event": event})
+        self._raw_timeline.append((category, timestamp, event))
+
+    def _materialize_results(self):
+        """Build the issue, insight and timeline dicts written to the reports."""
+        self.issues = [
+            {"category": category, "message": message, "severity": severity, "timestamp": self._analyzed_at}
+            for category, message, severity in self._raw_issues
+        ]
+        self.insights = [
+            {"category": category, "message": message, "timestamp": self._analyzed_at}
+            for category, message in self._raw_insights
+        ]
+        self.timeline = [
+            {"category": category, "timestamp": timestamp.isoformat(), "event": event}
+            for category, timestamp, event in self._raw_timeline
+        ]
 
     def _generate_summary(self):
         """Generate overall analysis summary."""
-        total_errors = sum(1 for issue in self.issues if issue["severity"] == "error")
-        total_warnings = sum(1 for issue in self.issues if issue["severity"] == "warning")
+        total_errors = self._issue_counts_by_severity["error"]
+        total_warnings = self._issue_counts_by_severity["warning"]
 
         self.metrics.update(
             {
-                "total_issues": len(self.issues),
+                "total_issues": len(self._raw_issues),
                 "total_errors": total_errors,
                 "total_warnings": total_warnings,
-                "total_insights": len(self.insights),
-                "analysis_timestamp": datetime.now().isoformat(),
+                "total_insights": len(self._raw_insights),
+                "analysis_timestamp": self._analyzed_at,
             }
         )
 
@@ -430,7 +685,7 @@ class LogAnalyzer:
             )
 
         # Check for container issues
-        container_errors = sum(1 for issue in self.issues if issue["category"] == "container")
+        container_errors = self._issue_counts_by_category["container"]
         if container_errors > 0:
             recommendations.append(
                 {
@@ -442,7 +697,7 @@ class LogAnalyzer:
             )
 
         # Check for Tailscale issues
-        tailscale_errors = sum(1 for issue in self.issues if issue["category"] == "tailscale")
+        tailscale_errors = self._issue_counts_by_category["tailscale"]
         if tailscale_errors > 0:
             recommendations.append(
                 {
@@ -454,7 +709,9 @@ class LogAnalyzer:
             )
 
         # Check for test failures
-        molecule_errors = sum(1 for issue in self.issues if "molecule" in issue["category"])
+        molecule_errors = sum(
+            count for category, count in self._issue_counts_by_category.items() if "molecule" in category
+        )
         if molecule_errors > 0:
             recommendations.append(
                 {
@@ -471,8 +728,8 @@ class LogAnalyzer:
         """Save analysis results to files."""
         # Save JSON results
         json_file = self.output_dir / "analysis-results.json"
-        with open(json_file, "w") as f:
-            json.dump(results, f, indent=2, default=str)
+        # Serialize in one call and write once rather than streaming small chunks
+        json_file.write_text(json.dumps(results, indent=2, default=str))
 
         # Save markdown report
         self._generate_markdown_report(results)
@@ -484,73 +741,79 @@ class LogAnalyzer:
         """Generate a markdown analysis report."""
         md_file = self.output_dir / "analysis-report.md"
 
-        with open(md_file, "w") as f:
-            f.write("# macOS Test Log Analysis Report\n\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-
-            # Executive Summary
-            f.write("## Executive Summary\n\n")
-            metrics = results.get("metrics", {})
-            f.write(f"- **Total Issues**: {metrics.get('total_issues', 0)}\n")
-            f.write(f"- **Errors**: {metrics.get('total_errors', 0)}\n")
-            f.write(f"- **Warnings**: {metrics.get('total_warnings', 0)}\n")
-            f.write(f"- **Insights**: {metrics.get('total_insights', 0)}\n\n")
-
-            # Issues
-            issues = results.get("issues", [])
-            if issues:
-                f.write("## Issues Found\n\n")
-                for issue in issues:
-                    severity_emoji = "🔴" if issue["severity"] == "error" else "🟡"
-                    f.write(f"- {severity_emoji} **{issue['category'].title()}**: {issue['message']}\n")
-                f.write("\n")
-
-            # Recommendations
-            recommendations = metrics.get("recommendations", [])
-            if recommendations:
-                f.write("## Recommendations\n\n")
-                for rec in recommendations:
-                    priority_emoji = (
-                        "🔴" if rec["priority"] == "high" else "🟡" if rec["priority"] == "medium" else "🟢"
-                    )
-                    f.write(f"### {priority_emoji} {rec['category'].title()}\n")
-                    f.write(f"{rec['message']}\n")
-                    f.write(f"**Action**: {rec['action']}\n\n")
-
-            # Metrics
-            f.write("## Detailed Metrics\n\n")
-            for key, value in metrics.items():
-                if key not in ["recommendations"]:
-                    f.write(f"- **{key.replace('_', ' ').title()}**: {value}\n")
+        # Assemble the report in memory and write it with a single call
+        parts = ["# macOS Test Log Analysis Report\n\n"]
+        parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+        # Executive Summary
+        parts.append("## Executive Summary\n\n")
+        metrics = results.get("metrics", {})
+        parts.append(f"- **Total Issues**: {metrics.get('total_issues', 0)}\n")
+        parts.append(f"- **Errors**: {metrics.get('total_errors', 0)}\n")
+        parts.append(f"- **Warnings**: {metrics.get('total_warnings', 0)}\n")
+        parts.append(f"- **Insights**: {metrics.get('total_insights', 0)}\n\n")
+
+        # Issues
+        issues = results.get("issues", [])
+        if issues:
+            parts.append("## Issues Found\n\n")
+            category_titles = {}
+            for issue in issues:
+                category = issue["category"]
+                if category not in category_titles:
+                    category_titles[category] = category.title()
+                severity_emoji = "🔴" if issue["severity"] == "error" else "🟡"
+                parts.append(f"- {severity_emoji} **{category_titles[category]}**: {issue['message']}\n")
+            parts.append("\n")
+
+        # Recommendations
+        recommendations = metrics.get("recommendations", [])
+        if recommendations:
+            parts.append("## Recommendations\n\n")
+            for rec in recommendations:
+                priority_emoji = "🔴" if rec["priority"] == "high" else "🟡" if rec["priority"] == "medium" else "🟢"
+                parts.append(f"### {priority_emoji} {rec['category'].title()}\n")
+                parts.append(f"{rec['message']}\n")
+                parts.append(f"**Action**: {rec['action']}\n\n")
+
+        # Metrics
+        parts.append("## Detailed Metrics\n\n")
+        for key, value in metrics.items():
+            if key != "recommendations":
+                parts.append(f"- **{key.replace('_', ' ').title()}**: {value}\n")
+
+        md_file.write_text("".join(parts), encoding="utf-8")
 
     def _generate_text_summary(self, results: Dict):
         """Generate a concise text summary."""
         summary_file = self.output_dir / "analysis-summary.txt"
 
-        with open(summary_file, "w") as f:
-            f.write("=== macOS Test Log Analysis Summary ===\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        # Assemble the summary in memory and write it with a single call
+        parts = ["=== macOS Test Log Analysis Summary ===\n"]
+        parts.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+        metrics = results.get("metrics", {})
+        parts.append(f"Total Issues: {metrics.get('total_issues', 0)}\n")
+        parts.append(f"Errors: {metrics.get('total_errors', 0)}\n")
+        parts.append(f"Warnings: {metrics.get('total_warnings', 0)}\n")
+        parts.append(f"Insights: {metrics.get('total_insights', 0)}\n\n")
 
-            metrics = results.get("metrics", {})
-            f.write(f"Total Issues: {metrics.get('total_issues', 0)}\n")
-            f.write(f"Errors: {metrics.get('total_errors', 0)}\n")
-            f.write(f"Warnings: {metrics.get('total_warnings', 0)}\n")
-            f.write(f"Insights: {metrics.get('total_insights', 0)}\n\n")
+        # Top issues
+        issues = results.get("issues", [])[:5]
+        if issues:
+            parts.append("Top Issues:\n")
+            for issue in issues:
+                parts.append(f"- [{issue['severity'].upper()}] {issue['category']}: {issue['message']}\n")
+            parts.append("\n")
 
-            # Top issues
-            issues = results.get("issues", [])[:5]
-            if issues:
-                f.write("Top Issues:\n")
-                for issue in issues:
-                    f.write(f"- [{issue['severity'].upper()}] {issue['category']}: {issue['message']}\n")
-                f.write("\n")
+        # Key recommendations
+        recommendations = metrics.get("recommendations", [])[:3]
+        if recommendations:
+            parts.append("Key Recommendations:\n")
+            for rec in recommendations:
+                parts.append(f"- {rec['message']}\n")
 
-            # Key recommendations
-            recommendations = metrics.get("recommendations", [])[:3]
-            if recommendations:
-                f.write("Key Recommendations:\n")
-                for rec in recommendations:
-                    f.write(f"- {rec['message']}\n")
+        summary_file.write_text("".join(parts), encoding="utf-8")
 
 
 def main():
@@ -559,6 +822,13 @@ def main():
     parser.add_argument("--log-dir", required=True, help="Directory containing collected logs")
     parser.add_argument("--output-dir", help="Output directory for analysis results")
     parser.add_argument("--format", choices=["json", "markdown", "text", "all"], default="all", help="Output format(s)")
+    parser.add_argument("--timeline", action="store_true", help="Include a per-log-entry timeline in the JSON results")
+    parser.add_argument(
+        "--stop-on-fatal",
+        action="store_true",
+        help="Stop scanning a log after the first line with a fatal pattern such as a kernel panic "
+        "(counts for a log cut short become lower bounds)",
+    )
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
 
     args = parser.parse_args()
@@ -567,7 +837,7 @@ def main():
     output_dir = args.output_dir or str(Path(args.log_dir).parent / "analysis")
 
     # Run analysis
-    analyzer = LogAnalyzer(args.log_dir, output_dir)
+    analyzer = LogAnalyzer(args.log_dir, output_dir, collect_timeline=args.timeline, stop_on_fatal=args.stop_on_fatal)
     results = analyzer.analyze_all_logs()
 
     if args.verbose:
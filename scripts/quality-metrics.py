@@ -7,26 +7,187 @@ and generates comprehensive quality reports including code coverage,
 test results, security scores, and maintainability metrics.
 """
 
+import bisect
 import json
+import mmap
 import os
 import re
 import subprocess
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+# Lines that are empty or whitespace-only, and lines whose first non-whitespace
+# character is "#". Matching whole buffers keeps line classification in C; the
+# patterns work on raw bytes since only ASCII whitespace, "#" and "\n" matter.
+_BLANK_LINE_RE = re.compile(rb"^[^\S\n]*$", re.MULTILINE)
+_COMMENT_LINE_RE = re.compile(rb"^[^\S\n]*#", re.MULTILINE)
+
+# Vulnerability count in a safety summary, e.g. "3 vulnerabilities reported"
+_SAFETY_COUNT_RE = re.compile(r"(\d+)\s+vulnerabilities?")
+
+# File extension -> file type bucket in the code metrics; anything else is "other"
+_EXT_BUCKET = {
+    ".yml": "yaml",
+    ".yaml": "yaml",
+    ".py": "python",
+    ".md": "markdown",
+    ".rst": "markdown",
+    ".json": "json",
+}
+
+# Build and artifact directories left out of the code metrics walk
+_SKIP_DIRS = frozenset({"__pycache__", "node_modules", ".git", ".tox", ".molecule"})
+
+# Below this many files, worker process startup costs more than it saves
+_PARALLEL_MIN_FILES = 512
+
+# Larger files are memory-mapped rather than read into a bytes copy; newlines in a
+# mapping are counted a block at a time to keep peak memory flat
+_MMAP_MIN_SIZE = 64 * 1024
+_COUNT_BLOCK_SIZE = 1024 * 1024
+
+# Files above this size, or with a binary extension, count towards file and size totals
+# but are not opened for line counting
+_MAX_LINE_COUNT_SIZE = 4 * 1024 * 1024
+_BINARY_EXTS = frozenset(
+    {
+        ".7z",
+        ".bin",
+        ".bz2",
+        ".dmg",
+        ".gif",
+        ".gz",
+        ".ico",
+        ".img",
+        ".iso",
+        ".jar",
+        ".jpeg",
+        ".jpg",
+        ".pdf",
+        ".png",
+        ".pyc",
+        ".qcow2",
+        ".so",
+        ".tar",
+        ".tgz",
+        ".whl",
+        ".xz",
+        ".zip",
+    }
+)
+
+
+def _scan_files(directory: str) -> Iterator[os.DirEntry]:
+    """Recursively yield non-hidden file entries, skipping build and artifact directories.
+
+    The returned entries carry the directory listing's cached type and stat data,
+    so callers need no extra path objects or stat calls.
+    """
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        # Like os.walk, skip directories that can't be listed
+        return
+    with entries:
+        for entry in entries:
+            name = entry.name
+            # Skip hidden files and directories
+            if name[:1] == ".":
+                continue
+            if not entry.is_dir():
+                yield entry
+            # Skip common build/artifact directories; like os.walk, do not follow symlinks
+            elif name not in _SKIP_DIRS and not entry.is_symlink():
+                yield from _scan_files(entry.path)
+
+
+def _scan_doc_files(directory: str) -> Iterator[os.DirEntry]:
+    """Recursively yield Markdown and reStructuredText entries below ``directory``."""
+    try:
+        entries = os.scandir(directory)
+    except OSError:
+        return
+    with entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scan_doc_files(entry.path)
+            elif entry.name.endswith((".md", ".rst")):
+                yield entry
+
+
+def _count_lines(content: Union[bytes, mmap.mmap]) -> Tuple[int, int, int, int]:
+    """Return total, code, comment and blank line counts for raw file content."""
+    newlines = sum(
+        content[start : start + _COUNT_BLOCK_SIZE].count(b"\n") for start in range(0, len(content), _COUNT_BLOCK_SIZE)
+    )
+    total = newlines + 1
+    blank = sum(1 for _ in _BLANK_LINE_RE.finditer(content))
+    comments = sum(1 for _ in _COMMENT_LINE_RE.finditer(content))
+    return total, total - blank - comments, comments, blank
+
+
+def _count_file_lines(path: str) -> Optional[Tuple[int, int, int, int]]:
+    """Return the line counts of ``path``, or None if it can't be read."""
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size > _MMAP_MIN_SIZE:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    return _count_lines(content)
+            return _count_lines(f.read())
+    except (OSError, ValueError):
+        # ValueError: the file was truncated to empty before it could be mapped
+        return None
 
 
 class QualityMetricsCollector:
     """Collects and analyzes quality metrics for the Ansible collection."""
 
-    def __init__(self, project_root: str = "."):
+    # Security score penalty applied once for each severity with any findings
+    _SEV_PENALTIES = (("critical", 40), ("high", 20), ("medium", 10), ("low", 5))
+
+    def __init__(self, project_root: str = ".", cache_file: Optional[str] = None):
         self.project_root = Path(project_root).resolve()
         self.metrics = {
             "timestamp": datetime.utcnow().isoformat() + "Z",
             "project": {"name": "kaitranntt.mac", "version": "1.0.0", "root": str(self.project_root)},
             "metrics": {},
         }
+        # Line counts from earlier runs, keyed by "path:mtime_ns:size"
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._line_cache = self._load_line_cache()
+
+    def _load_line_cache(self) -> Dict[str, List[int]]:
+        """Load cached line counts; a missing or unreadable cache is treated as empty.
+
+        Entries that are not four integer line counts are dropped.
+        """
+        if not self.cache_file:
+            return {}
+        try:
+            cache = json.loads(self.cache_file.read_bytes())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict):
+            return {}
+        return {
+            key: counts
+            for key, counts in cache.items()
+            if isinstance(counts, list) and len(counts) == 4 and all(type(count) is int for count in counts)
+        }
+
+    def _save_line_cache(self):
+        """Write the line counts of this run's files back to the cache file."""
+        if not self.cache_file:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_file.write_text(json.dumps(self._line_cache), encoding="utf-8")
+        except OSError as e:
+            print(f"⚠️  Could not write metrics cache {self.cache_file}: {e}")
 
     def run_command(self, command: List[str], cwd: Optional[str] = None) -> Tuple[int, str, str]:
         """Run a command and return exit code, stdout, and stderr."""
@@ -38,6 +199,59 @@ class QualityMetricsCollector:
         except Exception as e:
             return 1, "", str(e)
 
+    def run_command_line_count(self, command: List[str], cwd: Optional[str] = None) -> Tuple[int, int, str]:
+        """Run a command and return exit code, stdout line count, and stderr.
+
+        stdout is counted as it streams instead of being kept in memory. Leading and trailing
+        blank lines are not counted, matching ``len(stdout.strip().split("\\n"))``.
+        """
+        try:
+            with subprocess.Popen(
+                command,
+                cwd=cwd or self.project_root,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            ) as process:
+                timed_out = threading.Event()
+
+                def kill():
+                    timed_out.set()
+                    process.kill()
+
+                timer = threading.Timer(300, kill)
+                timer.start()
+                try:
+                    # Drain stderr alongside stdout so a chatty stderr can't block the command
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        stderr_future = executor.submit(process.stderr.read)
+                        first = last = None
+                        for index, line in enumerate(process.stdout):
+                            if not line.isspace():
+                                if first is None:
+                                    first = index
+                                last = index
+                        stderr = stderr_future.result()
+                    returncode = process.wait()
+                finally:
+                    timer.cancel()
+        except Exception as e:
+            return 1, 0, str(e)
+
+        if timed_out.is_set():
+            return 1, 0, "Command timed out"
+        return returncode, 0 if first is None else last - first + 1, stderr
+
+    def run_commands_parallel(
+        self, commands: List[List[str]], runner: Optional[Callable[[List[str]], Tuple]] = None
+    ) -> List[Tuple]:
+        """Run independent commands concurrently with ``runner`` (default: run_command).
+
+        Results follow the order of ``commands``.
+        """
+        with ThreadPoolExecutor(max_workers=len(commands)) as executor:
+            return list(executor.map(runner or self.run_command, commands))
+
     def collect_code_metrics(self) -> Dict:
         """Collect basic code metrics like line counts and file statistics."""
         print("📊 Collecting code metrics...")
@@ -48,56 +262,65 @@ class QualityMetricsCollector:
             "size": {"total_bytes": 0, "total_kb": 0},
         }
 
-        # Walk through project files
-        for root, dirs, files in os.walk(self.project_root):
-            # Skip hidden directories and common build/artifact directories
-            dirs[:] = [
-                d
-                for d in dirs
-                if not d.startswith(".") and d not in ["__pycache__", "node_modules", ".git", ".tox", ".molecule"]
-            ]
-
-            for file in files:
-                if file.startswith("."):
-                    continue
+        # Walk through project files; files whose mtime and size match the cache reuse
+        # their cached line counts, and only the rest are opened
+        files = []
+        pending = []
+        for entry in _scan_files(str(self.project_root)):
+            try:
+                stat = entry.stat()
+            except OSError:
+                # Skip files that can't be read, e.g. broken symlinks
+                continue
+            ext = os.path.splitext(entry.name)[1]
+            if stat.st_size > _MAX_LINE_COUNT_SIZE or ext.lower() in _BINARY_EXTS:
+                # Huge or binary files yield no meaningful line counts; record them by size only
+                files.append((ext, stat.st_size, None))
+                continue
+            key = f"{entry.path}:{stat.st_mtime_ns}:{stat.st_size}"
+            files.append((ext, stat.st_size, key))
+            if key not in self._line_cache:
+                pending.append((entry.path, key))
+
+        # Per-file work is independent, so large batches are spread across one process per core
+        workers = os.cpu_count() or 1
+        pending_paths = [path for path, _ in pending]
+        if len(pending) < _PARALLEL_MIN_FILES or workers == 1:
+            counted = map(_count_file_lines, pending_paths)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                counted = list(
+                    executor.map(_count_file_lines, pending_paths, chunksize=max(1, len(pending) // (workers * 4)))
+                )
 
-                file_path = Path(root) / file
-                relative_path = file_path.relative_to(self.project_root)
+        # Rebuild the cache from this run's files so entries for changed or deleted files are dropped
+        line_cache = {}
+        for (_, key), counts in zip(pending, counted):
+            if counts is not None:
+                line_cache[key] = counts
 
-                try:
-                    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                        content = f.read()
-                        lines = content.split("\n")
-
-                    metrics["files"]["total"] += 1
-                    metrics["size"]["total_bytes"] += file_path.stat().st_size
-
-                    # File type counting
-                    if file.endswith((".yml", ".yaml")):
-                        metrics["files"]["yaml"] += 1
-                    elif file.endswith(".py"):
-                        metrics["files"]["python"] += 1
-                    elif file.endswith((".md", ".rst")):
-                        metrics["files"]["markdown"] += 1
-                    elif file.endswith(".json"):
-                        metrics["files"]["json"] += 1
-                    else:
-                        metrics["files"]["other"] += 1
-
-                    # Line counting
-                    for line in lines:
-                        metrics["lines"]["total"] += 1
-                        line_stripped = line.strip()
-                        if not line_stripped:
-                            metrics["lines"]["blank"] += 1
-                        elif line_stripped.startswith("#"):
-                            metrics["lines"]["comments"] += 1
-                        else:
-                            metrics["lines"]["code"] += 1
-
-                except (OSError, UnicodeDecodeError):
+        for ext, size, key in files:
+            if key is None:
+                counts = (0, 0, 0, 0)
+            else:
+                counts = line_cache.get(key) or self._line_cache.get(key)
+                if counts is None:
                     # Skip files that can't be read
                     continue
+                line_cache[key] = counts
+
+            metrics["files"]["total"] += 1
+            metrics["files"][_EXT_BUCKET.get(ext, "other")] += 1
+            metrics["size"]["total_bytes"] += size
+
+            # Line counting
+            total, code, comments, blank = counts
+            metrics["lines"]["total"] += total
+            metrics["lines"]["code"] += code
+            metrics["lines"]["comments"] += comments
+            metrics["lines"]["blank"] += blank
+
+        self._line_cache = line_cache
 
         metrics["size"]["total_kb"] = round(metrics["size"]["total_bytes"] / 1024, 2)
 
@@ -133,24 +356,30 @@ class QualityMetricsCollector:
             "yamllint": {"status": "not_run", "issues": 0, "errors": 0, "warnings": 0},
         }
 
-        # Run ansible-lint
-        returncode, stdout, stderr = self.run_command(["ansible-lint", ".", "--quiet", "--parseable"])
+        # The linters are independent, so run them side by side; only their output line counts are used
+        ansible_lint_result, yamllint_result = self.run_commands_parallel(
+            [["ansible-lint", ".", "--quiet", "--parseable"], ["yamllint", ".", "--format", "parsable"]],
+            runner=self.run_command_line_count,
+        )
+
+        # ansible-lint results
+        returncode, output_lines, stderr = ansible_lint_result
         if returncode == 0:
             metrics["ansible_lint"]["status"] = "passed"
             metrics["ansible_lint"]["issues"] = 0
         else:
             metrics["ansible_lint"]["status"] = "failed"
             # Count issues from output
-            metrics["ansible_lint"]["issues"] = len(stdout.strip().split("\n")) if stdout.strip() else 0
+            metrics["ansible_lint"]["issues"] = output_lines
 
-        # Run yamllint
-        returncode, stdout, stderr = self.run_command(["yamllint", ".", "--format", "parsable"])
+        # yamllint results
+        returncode, output_lines, stderr = yamllint_result
         if returncode == 0:
             metrics["yamllint"]["status"] = "passed"
             metrics["yamllint"]["issues"] = 0
         else:
             metrics["yamllint"]["status"] = "failed"
-            metrics["yamllint"]["issues"] = len(stdout.strip().split("\n")) if stdout.strip() else 0
+            metrics["yamllint"]["issues"] = output_lines
 
         # Check Molecule test results
         molecule_dir = self.project_root / "molecule" / "default"
@@ -184,101 +413,106 @@ class QualityMetricsCollector:
             },
         }
 
-        # Look for existing security reports
+        # Look for existing security reports with one directory listing, dispatching each known
+        # report file to its parser
         security_dir = self.project_root / "security-reports"
-        if security_dir.exists():
+        if security_dir.is_dir():
             metrics["scan_status"] = "reports_available"
 
-            # Checkov report
-            checkov_report = security_dir / "checkov-report.json"
-            if checkov_report.exists() and checkov_report.is_file():
-                try:
-                    with open(checkov_report, "r") as f:
-                        checkov_data = json.load(f)
-                        metrics["tools"]["checkov"]["status"] = "completed"
-                        metrics["tools"]["checkov"]["issues"] = len(
-                            checkov_data.get("results", {}).get("failed_controls", [])
-                        )
-
-                        # Count by severity
-                        for result in checkov_data.get("results", {}).get("failed_controls", []):
-                            severity = result.get("severity", "unknown").lower()
-                            if severity in metrics["vulnerabilities"]:
-                                metrics["vulnerabilities"][severity] += 1
-                except (json.JSONDecodeError, KeyError):
-                    pass
-
-            # Bandit report
-            bandit_report = security_dir / "bandit-report.json"
-            if bandit_report.exists() and bandit_report.is_file():
-                try:
-                    with open(bandit_report, "r") as f:
-                        bandit_data = json.load(f)
-                        metrics["tools"]["bandit"]["status"] = "completed"
-                        metrics["tools"]["bandit"]["issues"] = len(bandit_data.get("results", []))
-
-                        # Count by severity (bandit uses different severity levels)
-                        for result in bandit_data.get("results", []):
-                            issue_severity = result.get("issue_severity", "LOW").upper()
-                            if issue_severity in ["HIGH"]:
-                                metrics["vulnerabilities"]["high"] += 1
-                            elif issue_severity in ["MEDIUM"]:
-                                metrics["vulnerabilities"]["medium"] += 1
-                            else:
-                                metrics["vulnerabilities"]["low"] += 1
-                except (json.JSONDecodeError, KeyError):
-                    pass
-
-            # Safety report
-            safety_report = security_dir / "safety-summary.txt"
-            if safety_report.exists() and safety_report.is_file():
-                try:
-                    with open(safety_report, "r") as f:
-                        content = f.read()
-                        metrics["tools"]["safety"]["status"] = "completed"
-                        # Extract vulnerability count from safety summary
-                        if "0 vulnerabilities reported" in content:
-                            metrics["tools"]["safety"]["issues"] = 0
-                        else:
-                            # Try to extract number from text
-                            match = re.search(r"(\d+)\s+vulnerabilities?", content)
-                            if match:
-                                metrics["tools"]["safety"]["issues"] = int(match.group(1))
-                                metrics["vulnerabilities"]["medium"] += int(match.group(1))
-                except OSError:
-                    pass
-
-            # Secrets report
-            secrets_report = security_dir / "secret-files.txt"
-            if secrets_report.exists() and secrets_report.is_file():
-                try:
-                    with open(secrets_report, "r") as f:
-                        content = f.read()
-                        metrics["tools"]["secrets"]["status"] = "completed"
-                        # Count non-certificate files (certificates are expected)
-                        lines = [line.strip() for line in content.split("\n") if line.strip()]
-                        non_cert_lines = [line for line in lines if "certifi" not in line and ".pem" not in line]
-                        metrics["tools"]["secrets"]["secrets_found"] = len(non_cert_lines)
-                        if len(non_cert_lines) > 0:
-                            metrics["vulnerabilities"]["critical"] += len(non_cert_lines)
-                except OSError:
-                    pass
+            handlers = {
+                "checkov-report.json": self._parse_checkov_report,
+                "bandit-report.json": self._parse_bandit_report,
+                "safety-summary.txt": self._parse_safety_report,
+                "secret-files.txt": self._parse_secrets_report,
+            }
+            with os.scandir(security_dir) as entries:
+                for entry in entries:
+                    handler = handlers.get(entry.name)
+                    if handler and entry.is_file():
+                        handler(entry.path, metrics)
 
             # Calculate overall security score (simple scoring algorithm)
-            total_score = 100
-            if metrics["vulnerabilities"]["critical"] > 0:
-                total_score -= 40
-            if metrics["vulnerabilities"]["high"] > 0:
-                total_score -= 20
-            if metrics["vulnerabilities"]["medium"] > 0:
-                total_score -= 10
-            if metrics["vulnerabilities"]["low"] > 0:
-                total_score -= 5
+            vulnerabilities = metrics["vulnerabilities"]
+            total_score = 100 - sum(
+                penalty for severity, penalty in self._SEV_PENALTIES if vulnerabilities[severity] > 0
+            )
 
             metrics["overall_score"] = max(0, total_score)
 
         return metrics
 
+    def _parse_checkov_report(self, path: str, metrics: Dict):
+        """Add Checkov failed controls to the security metrics."""
+        try:
+            with open(path, "rb") as f:
+                checkov_results = json.loads(f.read()).get("results", {})
+            failed_controls = checkov_results.get("failed_controls", [])
+            metrics["tools"]["checkov"]["status"] = "completed"
+            metrics["tools"]["checkov"]["issues"] = len(failed_controls)
+
+            # Count by severity
+            vulnerabilities = metrics["vulnerabilities"]
+            for result in failed_controls:
+                severity = result.get("severity", "unknown").lower()
+                if severity in vulnerabilities:
+                    vulnerabilities[severity] += 1
+        except (json.JSONDecodeError, KeyError):
+            pass
+
+    def _parse_bandit_report(self, path: str, metrics: Dict):
+        """Add Bandit findings to the security metrics."""
+        try:
+            with open(path, "rb") as f:
+                bandit_results = json.loads(f.read()).get("results", [])
+            metrics["tools"]["bandit"]["status"] = "completed"
+            metrics["tools"]["bandit"]["issues"] = len(bandit_results)
+
+            # Count by severity (bandit uses different severity levels)
+            for result in bandit_results:
+                issue_severity = result.get("issue_severity", "LOW").upper()
+                if issue_severity in ["HIGH"]:
+                    metrics["vulnerabilities"]["high"] += 1
+                elif issue_severity in ["MEDIUM"]:
+                    metrics["vulnerabilities"]["medium"] += 1
+                else:
+                    metrics["vulnerabilities"]["low"] += 1
+        except (json.JSONDecodeError, KeyError):
+            pass
+
+    def _parse_safety_report(self, path: str, metrics: Dict):
+        """Add the vulnerability count from a safety summary to the security metrics."""
+        try:
+            with open(path, "r") as f:
+                content = f.read()
+                metrics["tools"]["safety"]["status"] = "completed"
+                # Extract vulnerability count from safety summary
+                if "0 vulnerabilities reported" in content:
+                    metrics["tools"]["safety"]["issues"] = 0
+                else:
+                    # Try to extract number from text
+                    match = _SAFETY_COUNT_RE.search(content)
+                    if match:
+                        issues = int(match.group(1))
+                        metrics["tools"]["safety"]["issues"] = issues
+                        metrics["vulnerabilities"]["medium"] += issues
+        except OSError:
+            pass
+
+    def _parse_secrets_report(self, path: str, metrics: Dict):
+        """Add files flagged by the secrets scan to the security metrics."""
+        try:
+            with open(path, "r") as f:
+                content = f.read()
+                metrics["tools"]["secrets"]["status"] = "completed"
+                # Count non-certificate files (certificates are expected)
+                lines = [line.strip() for line in content.split("\n") if line.strip()]
+                non_cert_lines = [line for line in lines if "certifi" not in line and ".pem" not in line]
+                metrics["tools"]["secrets"]["secrets_found"] = len(non_cert_lines)
+                if len(non_cert_lines) > 0:
+                    metrics["vulnerabilities"]["critical"] += len(non_cert_lines)
+        except OSError:
+            pass
+
     def collect_documentation_metrics(self) -> Dict:
         """Collect documentation quality metrics."""
         print("📚 Collecting documentation metrics...")
@@ -309,49 +543,43 @@ class QualityMetricsCollector:
             },
         }
 
-        # Count documentation files
+        # Count documentation files in the project root with one directory listing
         docs_dir = self.project_root / "docs"
-        project_files = list(self.project_root.glob("*.md")) + list(self.project_root.glob("*.rst"))
+        with os.scandir(self.project_root) as entries:
+            project_files = [entry.name.lower() for entry in entries if entry.name.endswith((".md", ".rst"))]
 
         metrics["files"]["total"] = len(project_files)
 
-        for file_path in project_files:
-            if file_path.name.lower().startswith("readme"):
+        for name in project_files:
+            if name.startswith("readme"):
                 metrics["files"]["readme"] += 1
-            elif "contributing" in file_path.name.lower():
+            elif "contributing" in name:
                 metrics["files"]["contributing"] += 1
-            elif "changelog" in file_path.name.lower() or "change_log" in file_path.name.lower():
+            elif "changelog" in name or "change_log" in name:
                 metrics["files"]["changelog"] += 1
-            elif "license" in file_path.name.lower():
+            elif "license" in name:
                 metrics["files"]["license"] += 1
 
-        # Count docs directory files
+        # Count and classify docs directory files in a single walk
         if docs_dir.exists():
-            doc_files = list(docs_dir.rglob("*.md")) + list(docs_dir.rglob("*.rst"))
-            metrics["files"]["api_docs"] = len(
-                [
-                    f
-                    for f in doc_files
-                    if any(keyword in f.name.lower() for keyword in ["api", "modules", "roles", "plugins"])
-                ]
-            )
-            metrics["files"]["guides"] = len(
-                [
-                    f
-                    for f in doc_files
-                    if any(keyword in f.name.lower() for keyword in ["guide", "usage", "installation", "getting"])
-                ]
-            )
+            for entry in _scan_doc_files(str(docs_dir)):
+                name = entry.name.lower()
+                if any(keyword in name for keyword in ("api", "modules", "roles", "plugins")):
+                    metrics["files"]["api_docs"] += 1
+                if any(keyword in name for keyword in ("guide", "usage", "installation", "getting")):
+                    metrics["files"]["guides"] += 1
 
         # Analyze roles documentation
         roles_dir = self.project_root / "roles"
         if roles_dir.exists():
-            for role_dir in roles_dir.iterdir():
-                if role_dir.is_dir():
-                    metrics["coverage"]["total_roles"] += 1
-                    # Check if role has README
-                    if (role_dir / "README.md").exists() or (role_dir / "README.rst").exists():
-                        metrics["coverage"]["roles_documented"] += 1
+            with os.scandir(roles_dir) as role_entries:
+                for role_entry in role_entries:
+                    if role_entry.is_dir():
+                        metrics["coverage"]["total_roles"] += 1
+                        # Check if role has README with one listing rather than a probe per candidate name
+                        with os.scandir(role_entry.path) as entries:
+                            if any(entry.name in ("README.md", "README.rst") for entry in entries):
+                                metrics["coverage"]["roles_documented"] += 1
 
         # Calculate coverage score
         if metrics["coverage"]["total_roles"] > 0:
@@ -363,12 +591,12 @@ class QualityMetricsCollector:
         readme_file = self.project_root / "README.md"
         if readme_file.exists():
             try:
-                with open(readme_file, "r", encoding="utf-8") as f:
-                    content = f.read().lower()
-                    metrics["quality"]["word_count"] = len(content.split())
-                    metrics["quality"]["has_examples"] = "example" in content or "usage" in content
-                    metrics["quality"]["has_installation_guide"] = "install" in content
-                    metrics["quality"]["has_usage_guide"] = "usage" in content or "how to" in content
+                # The keywords are ASCII, so search the raw bytes rather than decoding the README
+                content = readme_file.read_bytes().lower()
+                metrics["quality"]["word_count"] = len(content.split())
+                metrics["quality"]["has_examples"] = b"example" in content or b"usage" in content
+                metrics["quality"]["has_installation_guide"] = b"install" in content
+                metrics["quality"]["has_usage_guide"] = b"usage" in content or b"how to" in content
             except OSError:
                 pass
 
@@ -391,10 +619,13 @@ class QualityMetricsCollector:
             "thresholds": {"A+": 90, "A": 80, "B": 70, "C": 60, "D": 50},
         }
 
+        collected = self.metrics["metrics"]
+        components = score_metrics["components"]
+
         # Code quality score (based on comment ratio and file organization)
-        code_metrics = self.metrics["metrics"].get("code", {})
-        if code_metrics.get("lines", {}).get("total", 0) > 0:
-            comment_ratio = code_metrics["lines"].get("comment_percentage", 0)
+        code_lines = collected.get("code", {}).get("lines", {})
+        if code_lines.get("total", 0) > 0:
+            comment_ratio = code_lines.get("comment_percentage", 0)
             # Good comment ratio is around 10-20%
             if 10 <= comment_ratio <= 25:
                 code_score = 100
@@ -402,71 +633,55 @@ class QualityMetricsCollector:
                 code_score = 80
             else:
                 code_score = 60
-            score_metrics["components"]["code_quality"]["score"] = code_score
+            components["code_quality"]["score"] = code_score
 
         # Test coverage score
-        test_metrics = self.metrics["metrics"].get("tests", {})
+        test_metrics = collected.get("tests", {})
         test_score = 100  # Start with perfect score
 
         if test_metrics.get("ansible_lint", {}).get("status") == "failed":
             test_score -= 20
         if test_metrics.get("yamllint", {}).get("status") == "failed":
             test_score -= 15
-        if test_metrics.get("molecule", {}).get("status") == "not_run":
+        molecule_status = test_metrics.get("molecule", {}).get("status")
+        if molecule_status == "not_run":
             test_score -= 30
-        elif test_metrics.get("molecule", {}).get("status") == "configured":
+        elif molecule_status == "configured":
             test_score -= 10
 
-        score_metrics["components"]["test_coverage"]["score"] = max(0, test_score)
+        components["test_coverage"]["score"] = max(0, test_score)
 
         # Security posture score
-        security_metrics = self.metrics["metrics"].get("security", {})
-        score_metrics["components"]["security_posture"]["score"] = security_metrics.get("overall_score", 0)
+        components["security_posture"]["score"] = collected.get("security", {}).get("overall_score", 0)
 
         # Documentation score
-        doc_metrics = self.metrics["metrics"].get("documentation", {})
+        doc_metrics = collected.get("documentation", {})
+        doc_files = doc_metrics.get("files", {})
+        doc_coverage_score = doc_metrics.get("coverage", {}).get("score", 0)
         doc_score = 0
 
-        if doc_metrics.get("files", {}).get("readme", 0) > 0:
+        if doc_files.get("readme", 0) > 0:
             doc_score += 25
-        if doc_metrics.get("files", {}).get("contributing", 0) > 0:
+        if doc_files.get("contributing", 0) > 0:
             doc_score += 15
-        if doc_metrics.get("files", {}).get("license", 0) > 0:
+        if doc_files.get("license", 0) > 0:
             doc_score += 10
-        if doc_metrics.get("coverage", {}).get("score", 0) > 0:
-            doc_score += doc_metrics["coverage"]["score"] * 0.3  # Max 30 points
+        if doc_coverage_score > 0:
+            doc_score += doc_coverage_score * 0.3  # Max 30 points
 
-        score_metrics["components"]["documentation"]["score"] = min(100, doc_score)
+        components["documentation"]["score"] = min(100, doc_score)
 
         # Calculate weighted overall score
-        total_weighted_score = 0
-        total_weight = 0
-
-        for component, data in score_metrics["components"].items():
-            weight = data["weight"]
-            score = data["score"]
-            total_weighted_score += weight * score
-            total_weight += weight
+        total_weighted_score = sum(data["weight"] * data["score"] for data in components.values())
+        total_weight = sum(data["weight"] for data in components.values())
 
         if total_weight > 0:
             score_metrics["overall_score"] = round(total_weighted_score / total_weight, 1)
 
-        # Determine grade
-        overall_score = score_metrics["overall_score"]
-        thresholds = score_metrics["thresholds"]
-
-        if overall_score >= thresholds["A+"]:
-            score_metrics["grade"] = "A+"
-        elif overall_score >= thresholds["A"]:
-            score_metrics["grade"] = "A"
-        elif overall_score >= thresholds["B"]:
-            score_metrics["grade"] = "B"
-        elif overall_score >= thresholds["C"]:
-            score_metrics["grade"] = "C"
-        elif overall_score >= thresholds["D"]:
-            score_metrics["grade"] = "D"
-        else:
-            score_metrics["grade"] = "F"
+        # Determine grade: the highest grade whose threshold the score reaches, else "F"
+        grades = sorted((threshold, grade) for grade, threshold in score_metrics["thresholds"].items())
+        reached = bisect.bisect_right([threshold for threshold, _ in grades], score_metrics["overall_score"])
+        score_metrics["grade"] = grades[reached - 1][1] if reached else "F"
 
         return score_metrics
 
@@ -489,8 +704,9 @@ class QualityMetricsCollector:
         output_path = Path(output_file)
         output_path.parent.mkdir(exist_ok=True)
 
-        with open(output_path, "w") as f:
-            json.dump(self.metrics, f, indent=2)
+        # Serialize in one go and write once rather than streaming many small writes
+        output_path.write_text(json.dumps(self.metrics, indent=2), encoding="utf-8")
+        self._save_line_cache()
 
         print(f"✅ Quality metrics report saved to: {output_path}")
         return output_path
@@ -509,102 +725,109 @@ class QualityMetricsCollector:
         security = self.metrics["metrics"]["security"]
         docs = self.metrics["metrics"]["documentation"]
 
-        report_content = f"""# Quality Metrics Report
-
-**Generated**: {self.metrics['timestamp']}
-**Project**: {self.metrics['project']['name']} v{self.metrics['project']['version']}
-
-## Executive Summary
-
-### Overall Quality Grade: {overall['grade']} ({overall['overall_score']}/100)
-
-{self._get_quality_emoji(overall['overall_score'])} The project demonstrates {'excellent' if overall['overall_score'] >= 90 else 'good' if overall['overall_score'] >= 80 else 'acceptable' if overall['overall_score'] >= 70 else 'needs improvement'} quality standards.
-
-### Component Scores
-
-| Component | Score | Weight | Contribution |
-|-----------|-------|--------|--------------|
-| Code Quality | {overall['components']['code_quality']['score']}/100 | {overall['components']['code_quality']['weight']}% | {round(overall['components']['code_quality']['score'] * overall['components']['code_quality']['weight'] / 100, 1)} |
-| Test Coverage | {overall['components']['test_coverage']['score']}/100 | {overall['components']['test_coverage']['weight']}% | {round(overall['components']['test_coverage']['score'] * overall['components']['test_coverage']['weight'] / 100, 1)} |
-| Security Posture | {overall['components']['security_posture']['score']}/100 | {overall['components']['security_posture']['weight']}% | {round(overall['components']['security_posture']['score'] * overall['components']['security_posture']['weight'] / 100, 1)} |
-| Documentation | {overall['components']['documentation']['score']}/100 | {overall['components']['documentation']['weight']}% | {round(overall['components']['documentation']['score'] * overall['components']['documentation']['weight'] / 100, 1)} |
-
-## Detailed Metrics
-
-### 📊 Code Quality
-
-**Files**: {code['files']['total']} total
-- YAML: {code['files']['yaml']}
-- Python: {code['files']['python']}
-- Markdown: {code['files']['markdown']}
-- Other: {code['files']['other']}
-
-**Lines**: {code['lines']['total']} total
-- Code: {code['lines']['code']} ({code['lines'].get('code_percentage', 0)}%)
-- Comments: {code['lines']['comments']} ({code['lines'].get('comment_percentage', 0)}%)
-- Blank: {code['lines']['blank']} ({code['lines'].get('blank_percentage', 0)}%)
-
-**Size**: {code['size']['total_kb']} KB
-
-### 🧪 Test Coverage
-
-| Test Type | Status | Issues |
-|------------|--------|--------|
-| Ansible Lint | {tests['ansible_lint']['status']} | {tests['ansible_lint']['issues']} |
-| YAML Lint | {tests['yamllint']['status']} | {tests['yamllint']['issues']} |
-| Molecule | {tests['molecule']['status']} | {tests['molecule'].get('scenarios_tested', 0)} scenarios |
-
-### 🛡️ Security Posture
-
-**Security Score**: {security['overall_score']}/100
-
-**Vulnerabilities**:
-- Critical: {security['vulnerabilities']['critical']}
-- High: {security['vulnerabilities']['high']}
-- Medium: {security['vulnerabilities']['medium']}
-- Low: {security['vulnerabilities']['low']}
-
-**Security Tools Status**:
-- Checkov: {security['tools']['checkov']['status']} ({security['tools']['checkov']['issues']} issues)
-- Bandit: {security['tools']['bandit']['status']} ({security['tools']['bandit']['issues']} issues)
-- Safety: {security['tools']['safety']['status']} ({security['tools']['safety']['issues']} issues)
-- Secret Scan: {security['tools']['secrets']['status']} ({security['tools']['secrets']['secrets_found']} secrets)
-
-### 📚 Documentation Quality
-
-**Files**: {docs['files']['total']} total
-- README: {docs['files']['readme']}
-- Contributing: {docs['files']['contributing']}
-- Changelog: {docs['files']['changelog']}
-- License: {docs['files']['license']}
-
-**Coverage**: {docs['coverage']['score']}% of roles documented
-- Roles documented: {docs['coverage']['roles_documented']}/{docs['coverage']['total_roles']}
-
-**Quality Indicators**:
-- Word count: {docs['quality']['word_count']}
-- Has examples: {'✅' if docs['quality']['has_examples'] else '❌'}
-- Has installation guide: {'✅' if docs['quality']['has_installation_guide'] else '❌'}
-- Has usage guide: {'✅' if docs['quality']['has_usage_guide'] else '❌'}
-
-## Recommendations
-
-{self._generate_recommendations(overall, tests, security, docs)}
-
-## Next Steps
-
-1. Address any failed tests or linting issues
-2. Improve documentation coverage if below 80%
-3. Monitor security scan results regularly
-4. Set up automated quality reporting in CI/CD
-
----
-
-*This report was generated automatically using the quality metrics collection script. For questions about these metrics, see the project documentation or contact the maintainers.*
-"""
-
-        with open(output_path, "w") as f:
-            f.write(report_content)
+        overall_score = overall["overall_score"]
+        if overall_score >= 90:
+            standard = "excellent"
+        elif overall_score >= 80:
+            standard = "good"
+        elif overall_score >= 70:
+            standard = "acceptable"
+        else:
+            standard = "needs improvement"
+
+        parts = ["# Quality Metrics Report\n\n"]
+        parts.append(f"**Generated**: {self.metrics['timestamp']}\n")
+        parts.append(f"**Project**: {self.metrics['project']['name']} v{self.metrics['project']['version']}\n\n")
+
+        # Executive summary
+        parts.append("## Executive Summary\n\n")
+        parts.append(f"### Overall Quality Grade: {overall['grade']} ({overall_score}/100)\n\n")
+        parts.append(
+            f"{self._get_quality_emoji(overall_score)} The project demonstrates {standard} quality standards.\n\n"
+        )
+        parts.append("### Component Scores\n\n")
+        parts.append("| Component | Score | Weight | Contribution |\n")
+        parts.append("|-----------|-------|--------|--------------|\n")
+        for label, key in (
+            ("Code Quality", "code_quality"),
+            ("Test Coverage", "test_coverage"),
+            ("Security Posture", "security_posture"),
+            ("Documentation", "documentation"),
+        ):
+            component = overall["components"][key]
+            contribution = round(component["score"] * component["weight"] / 100, 1)
+            parts.append(f"| {label} | {component['score']}/100 | {component['weight']}% | {contribution} |\n")
+        parts.append("\n## Detailed Metrics\n\n")
+
+        # Code quality
+        files, lines = code["files"], code["lines"]
+        parts.append("### 📊 Code Quality\n\n")
+        parts.append(f"**Files**: {files['total']} total\n")
+        parts.append(f"- YAML: {files['yaml']}\n")
+        parts.append(f"- Python: {files['python']}\n")
+        parts.append(f"- Markdown: {files['markdown']}\n")
+        parts.append(f"- Other: {files['other']}\n\n")
+        parts.append(f"**Lines**: {lines['total']} total\n")
+        parts.append(f"- Code: {lines['code']} ({lines.get('code_percentage', 0)}%)\n")
+        parts.append(f"- Comments: {lines['comments']} ({lines.get('comment_percentage', 0)}%)\n")
+        parts.append(f"- Blank: {lines['blank']} ({lines.get('blank_percentage', 0)}%)\n\n")
+        parts.append(f"**Size**: {code['size']['total_kb']} KB\n\n")
+
+        # Test coverage
+        parts.append("### 🧪 Test Coverage\n\n")
+        parts.append("| Test Type | Status | Issues |\n")
+        parts.append("|------------|--------|--------|\n")
+        parts.append(f"| Ansible Lint | {tests['ansible_lint']['status']} | {tests['ansible_lint']['issues']} |\n")
+        parts.append(f"| YAML Lint | {tests['yamllint']['status']} | {tests['yamllint']['issues']} |\n")
+        molecule = tests["molecule"]
+        parts.append(f"| Molecule | {molecule['status']} | {molecule.get('scenarios_tested', 0)} scenarios |\n\n")
+
+        # Security posture
+        vulnerabilities, tools = security["vulnerabilities"], security["tools"]
+        parts.append("### 🛡️ Security Posture\n\n")
+        parts.append(f"**Security Score**: {security['overall_score']}/100\n\n")
+        parts.append("**Vulnerabilities**:\n")
+        parts.append(f"- Critical: {vulnerabilities['critical']}\n")
+        parts.append(f"- High: {vulnerabilities['high']}\n")
+        parts.append(f"- Medium: {vulnerabilities['medium']}\n")
+        parts.append(f"- Low: {vulnerabilities['low']}\n\n")
+        parts.append("**Security Tools Status**:\n")
+        parts.append(f"- Checkov: {tools['checkov']['status']} ({tools['checkov']['issues']} issues)\n")
+        parts.append(f"- Bandit: {tools['bandit']['status']} ({tools['bandit']['issues']} issues)\n")
+        parts.append(f"- Safety: {tools['safety']['status']} ({tools['safety']['issues']} issues)\n")
+        parts.append(f"- Secret Scan: {tools['secrets']['status']} ({tools['secrets']['secrets_found']} secrets)\n\n")
+
+        # Documentation quality
+        doc_files, coverage, quality = docs["files"], docs["coverage"], docs["quality"]
+        parts.append("### 📚 Documentation Quality\n\n")
+        parts.append(f"**Files**: {doc_files['total']} total\n")
+        parts.append(f"- README: {doc_files['readme']}\n")
+        parts.append(f"- Contributing: {doc_files['contributing']}\n")
+        parts.append(f"- Changelog: {doc_files['changelog']}\n")
+        parts.append(f"- License: {doc_files['license']}\n\n")
+        parts.append(f"**Coverage**: {coverage['score']}% of roles documented\n")
+        parts.append(f"- Roles documented: {coverage['roles_documented']}/{coverage['total_roles']}\n\n")
+        parts.append("**Quality Indicators**:\n")
+        parts.append(f"- Word count: {quality['word_count']}\n")
+        parts.append(f"- Has examples: {'✅' if quality['has_examples'] else '❌'}\n")
+        parts.append(f"- Has installation guide: {'✅' if quality['has_installation_guide'] else '❌'}\n")
+        parts.append(f"- Has usage guide: {'✅' if quality['has_usage_guide'] else '❌'}\n\n")
+
+        # Recommendations and next steps
+        parts.append("## Recommendations\n\n")
+        parts.append(f"{self._generate_recommendations(overall, tests, security, docs)}\n\n")
+        parts.append("## Next Steps\n\n")
+        parts.append("1. Address any failed tests or linting issues\n")
+        parts.append("2. Improve documentation coverage if below 80%\n")
+        parts.append("3. Monitor security scan results regularly\n")
+        parts.append("4. Set up automated quality reporting in CI/CD\n\n")
+        parts.append("---\n\n")
+        parts.append(
+            "*This report was generated automatically using the quality metrics collection script. "
+            "For questions about these metrics, see the project documentation or contact the maintainers.*\n"
+        )
+
+        output_path.write_text("".join(parts), encoding="utf-8")
 
         print(f"✅ Markdown quality report saved to: {output_path}")
         return output_path
@@ -675,12 +898,18 @@ def main():
     parser.add_argument("--project-root", default=".", help="Project root directory")
     parser.add_argument("--output-json", default="quality-reports/quality-metrics.json", help="JSON output file")
     parser.add_argument("--output-md", default="quality-reports/QUALITY_REPORT.md", help="Markdown output file")
+    parser.add_argument(
+        "--cache-file",
+        default="quality-reports/.cache.json",
+        help="Line count cache reused across runs for unchanged files",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Recount every file and don't write the cache")
     parser.add_argument("--quiet", action="store_true", help="Suppress output messages")
 
     args = parser.parse_args()
 
     try:
-        collector = QualityMetricsCollector(args.project_root)
+        collector = QualityMetricsCollector(args.project_root, None if args.no_cache else args.cache_file)
 
         if not args.quiet:
             print("🔍 Starting quality metrics collection...")
@@ -688,9 +917,14 @@ def main():
         # Generate comprehensive report
         report = collector.generate_report()
 
-        # Save reports
-        collector.save_report(args.output_json)
-        collector.generate_markdown_report(args.output_md)
+        # Save reports; the two writes are independent, so on slow storage they overlap
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            saves = [
+                executor.submit(collector.save_report, args.output_json),
+                executor.submit(collector.generate_markdown_report, args.output_md),
+            ]
+            for save in saves:
+                save.result()
 
         if not args.quiet:
             print(
@@ -4,102 +4,486 @@
 Molecule plugin for collecting logs and artifacts from macOS tests.
 """
 
+import functools
 import json
 import os
+import re
+import shlex
+import shutil
 import subprocess
 import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+try:
+    import docker
+except ImportError:  # molecule-plugins[docker] normally provides it; fall back to the docker CLI
+    docker = None
+
+# Files up to this size are read whole so their total line count stays exact; larger
+# files are tailed by reading fixed-size blocks backwards from the end
+_TAIL_WHOLE_FILE_SIZE = 1024 * 1024
+_TAIL_BLOCK_SIZE = 8192
+
+# Default cap on the bytes kept from each log stream, since a single line can be megabytes long
+_MAX_LOG_BYTES = 1024 * 1024
+
+# Prefix docker adds to each line with --timestamps; its fixed width makes lines sort by time as text
+_DOCKER_TIMESTAMP_RE = re.compile(rb"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{9}Z ")
+
+# Command strings using any of these, or starting with a shell builtin or variable assignment,
+# still run through /bin/sh; everything else is split and executed directly
+_SHELL_SYNTAX = frozenset("|&;<>()$`*?[]{}~#!\n")
+_SHELL_BUILTINS = frozenset(
+    {
+        ".",
+        ":",
+        "alias",
+        "cd",
+        "command",
+        "eval",
+        "exec",
+        "exit",
+        "export",
+        "hash",
+        "local",
+        "read",
+        "readonly",
+        "return",
+        "set",
+        "shift",
+        "source",
+        "trap",
+        "type",
+        "ulimit",
+        "umask",
+        "unset",
+        "wait",
+    }
+)
+
 
 def collect_logs(sources):
     """Collect logs from various sources."""
     collected_logs = {}
 
-    for source in sources:
-        if source["type"] == "container":
-            collected_logs[source["name"]] = collect_container_logs(source)
-        elif source["type"] == "file":
-            collected_logs[source["name"]] = collect_file_logs(source)
-        elif source["type"] == "command":
-            collected_logs[source["name"]] = collect_command_logs(source)
+    # Keep the order of ``sources`` regardless of which finished first
+    for _, source, logs in sorted(_iter_collected_logs(sources), key=lambda collected: collected[0]):
+        collected_logs[source["name"]] = logs
 
     return collected_logs
 
 
-def collect_container_logs(source):
-    """Collect logs from Docker container."""
+def collect_logs_stream(sources, out=None):
+    """Write logs from various sources to ``out`` (default stdout) as NDJSON, one ``{name: logs}`` object per line.
+
+    Each source is written as soon as it finishes, so nothing waits on the slowest source and
+    only one source's logs are held as JSON at a time.
+    """
+    out = out or sys.stdout
+    for _, source, logs in _iter_collected_logs(sources):
+        out.write(json.dumps({source["name"]: logs}) + "\n")
+        out.flush()
+
+
+def _iter_collected_logs(sources):
+    """Yield ``(index, source, logs)`` for each source of a known type, in completion order."""
+    if not sources:
+        return
+
+    # Each source mostly waits on a subprocess, the Docker daemon or the disk, so collect them
+    # concurrently; the total time becomes that of the slowest source rather than the sum
+    # Sources of the same container share one lookup of it for this run
+    collectors = dict(_COLLECTORS, container=functools.partial(collect_container_logs, container_cache={}))
+    with ThreadPoolExecutor(max_workers=min(32, len(sources))) as executor:
+        futures = {}
+        for index, source in enumerate(sources):
+            collector = collectors.get(source["type"])
+            if collector is not None:
+                futures[executor.submit(collector, source)] = index
+        for future in as_completed(futures):
+            index = futures[future]
+            yield index, sources[index], future.result()
+
+
+def collect_container_logs(source, container_cache=None):
+    """Collect logs from Docker container.
+
+    ``container_cache`` maps container names to containers already looked up through the API.
+    """
     container_name = source.get("container_name", "macos-test-local")
     lines = source.get("lines", 100)
+    max_bytes = source.get("max_bytes", _MAX_LOG_BYTES)
+    timestamp = datetime.now().isoformat()
 
     try:
-        # Get container logs
-        result = subprocess.run(
-            ["docker", "logs", "--tail", str(lines), container_name], capture_output=True, text=True, timeout=30
-        )
+        # Prefer the Engine API over its socket; forking the docker CLI costs a process start per container
+        client = _docker_client()
+        if client is not None:
+            logs = _docker_logs_api(client, container_name, lines, container_cache)
+        else:
+            logs = _docker_logs_cli(container_name, lines, max_bytes)
+
+        if logs is None:
+            return {"error": "Timeout while collecting logs", "timestamp": timestamp}
+        stdout, stderr, return_code, returned_lines, has_more = logs
+        stdout, stdout_cut = _cap_bytes(stdout, max_bytes)
+        stderr, stderr_cut = _cap_bytes(stderr, max_bytes)
         return {
-            "stdout": result.stdout,
-            "stderr": result.stderr,
-            "return_code": result.returncode,
-            "timestamp": datetime.datetime.now().isoformat(),
+            "stdout": _decode(stdout),
+            "stderr": _decode(stderr),
+            "return_code": return_code,
+            # Lines of stdout and stderr together; docker's tail counts both streams
+            "returned_lines": returned_lines,
+            "is_truncated": has_more or stdout_cut or stderr_cut,
+            "timestamp": timestamp,
         }
-    except subprocess.TimeoutExpired:
-        return {"error": "Timeout while collecting logs", "timestamp": datetime.datetime.now().isoformat()}
     except Exception as e:
-        return {"error": f"Error collecting logs: {str(e)}", "timestamp": datetime.datetime.now().isoformat()}
+        return {"error": f"Error collecting logs: {str(e)}", "timestamp": timestamp}
+
+
+@functools.lru_cache(maxsize=None)
+def _docker_client():
+    """Return a shared Docker Engine API client, or None if the SDK or daemon settings are unavailable."""
+    if docker is None:
+        return None
+    try:
+        return docker.from_env(timeout=30)
+    except docker.errors.DockerException:
+        return None
+
+
+def _docker_logs_api(client, container_name, lines, container_cache=None):
+    """Return a container's last log lines via the API.
+
+    The result is stdout, stderr, exit code, number of lines returned and whether older output was left out.
+    """
+    container = container_cache.get(container_name) if container_cache is not None else None
+    if container is None:
+        container = client.containers.get(container_name)
+        if container_cache is not None:
+            container_cache[container_name] = container
+    # One line more than requested is fetched; getting it shows older output exists
+    stdout_tail = deque(container.logs(stdout=True, stderr=False, tail=lines + 1, timestamps=True).splitlines(True))
+    stderr_tail = deque(container.logs(stdout=False, stderr=True, tail=lines + 1, timestamps=True).splitlines(True))
+    lines_read = len(stdout_tail) + len(stderr_tail)
+    stdout, stderr, returned_lines, has_more = _merge_tails(stdout_tail, stderr_tail, lines_read, lines)
+    return stdout, stderr, 0, returned_lines, has_more
+
+
+def _docker_logs_cli(container_name, lines, max_bytes=_MAX_LOG_BYTES):
+    """Return the same as _docker_logs_api using ``docker logs``, or None if it timed out."""
+    # Keep at most `lines` lines, and not much more than `max_bytes`, of each stream in memory.
+    # As with the API, one extra line is requested to tell whether older output exists
+    with subprocess.Popen(
+        ["docker", "logs", "--timestamps", "--tail", str(lines + 1), container_name],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    ) as process:
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(30, kill)
+        timer.start()
+        try:
+            # docker logs replays the container's stderr on its own stderr; drain both pipes at once
+            stderr_result = []
+            stderr_reader = threading.Thread(
+                target=lambda: stderr_result.append(_tail_lines(process.stderr, lines, max_bytes))
+            )
+            stderr_reader.start()
+            stdout_tail, stdout_read = _tail_lines(process.stdout, lines, max_bytes)
+            stderr_reader.join()
+            return_code = process.wait()
+        finally:
+            timer.cancel()
+
+    if timed_out.is_set():
+        return None
+    stderr_tail, stderr_read = stderr_result[0]
+    stdout, stderr, returned_lines, has_more = _merge_tails(stdout_tail, stderr_tail, stdout_read + stderr_read, lines)
+    return stdout, stderr, return_code, returned_lines, has_more
+
+
+def _merge_tails(stdout_tail, stderr_tail, lines_read, lines):
+    """Trim timestamped stdout and stderr lines to the last ``lines`` lines of the combined log.
+
+    docker's tail covers both streams, and ``lines + 1`` lines were requested, so reading more
+    than ``lines`` in total shows older output was left out. Returns both streams without
+    timestamps, the number of lines kept and whether older output was left out.
+    """
+    while len(stdout_tail) + len(stderr_tail) > lines:
+        # Drop whichever stream's first line is older
+        if not stderr_tail or (stdout_tail and stdout_tail[0] <= stderr_tail[0]):
+            stdout_tail.popleft()
+        else:
+            stderr_tail.popleft()
+    return (
+        _strip_timestamps(stdout_tail),
+        _strip_timestamps(stderr_tail),
+        len(stdout_tail) + len(stderr_tail),
+        lines_read > lines,
+    )
+
+
+def _strip_timestamps(tail):
+    """Join lines, removing the prefix added by docker's --timestamps where present."""
+    return b"".join(line[match.end() :] if (match := _DOCKER_TIMESTAMP_RE.match(line)) else line for line in tail)
+
+
+def _tail_lines(stream, lines, max_bytes):
+    """Return a deque of the last ``lines`` lines of binary ``stream``, and the number of lines read.
+
+    Older lines are dropped early once the kept ones exceed ``max_bytes``; the newest line is always kept.
+    """
+    tail = deque(maxlen=lines)
+    size = 0
+    total_lines = 0
+    for line in stream:
+        if tail and len(tail) == lines:
+            size -= len(tail[0])
+        tail.append(line)
+        size += len(line)
+        total_lines += 1
+        while size > max_bytes and len(tail) > 1:
+            size -= len(tail.popleft())
+    return tail, total_lines
+
+
+def _cap_bytes(data, max_bytes):
+    """Return the end of ``data`` no longer than ``max_bytes`` and whether anything was cut.
+
+    The cut is moved forward to the next line start unless that would leave nothing,
+    and never splits a UTF-8 character.
+    """
+    if len(data) <= max_bytes:
+        return data, False
+    start = len(data) - max_bytes
+    if data[start - 1 : start] != b"\n":
+        newline = data.find(b"\n", start, len(data) - 1)
+        if newline != -1:
+            start = newline + 1
+        else:
+            # Skip UTF-8 continuation bytes
+            while start < len(data) and 0x80 <= data[start] < 0xC0:
+                start += 1
+    return data[start:], True
+
+
+def _decode(data):
+    """Decode log bytes as UTF-8 with universal newlines."""
+    return data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def _tail(file_path, lines, max_bytes=_MAX_LOG_BYTES):
+    """Return the last ``lines`` lines of a file, its total line count and whether anything was left out.
+
+    Large files are read backwards block by block only until enough lines, or more than
+    ``max_bytes``, are found; their total line count is not known and is returned as None.
+    The returned lines never exceed ``max_bytes`` once encoded as UTF-8.
+    """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        byte_capped = False
+        if size <= _TAIL_WHOLE_FILE_SIZE:
+            data = f.read()
+            offset = 0
+        else:
+            blocks = []
+            newlines = 0
+            offset = size
+            while offset > 0:
+                step = min(_TAIL_BLOCK_SIZE, offset)
+                offset -= step
+                f.seek(offset)
+                blocks.append(f.read(step))
+                newlines += blocks[-1].count(b"\n")
+                if newlines > lines:
+                    # Stop once the last N lines, ignoring trailing blank ones, are preceded by more text;
+                    # otherwise the file's leading whitespace may still need stripping
+                    parts = b"".join(reversed(blocks)).rstrip().rsplit(b"\n", lines)
+                    if len(parts) > lines and parts[0].strip():
+                        break
+                if size - offset > max_bytes:
+                    byte_capped = True
+                    break
+            data = b"".join(reversed(blocks))
+            if byte_capped:
+                data, _ = _cap_bytes(data, max_bytes)
+
+    content = _decode(data)
+    if offset == 0 and not byte_capped:
+        content = content.strip()
+        total_lines = content.count("\n") + 1
+    else:
+        # The first line of a partial read may be cut off, but it is never among the last N
+        content = content.rstrip()
+        total_lines = None
+    # Split off only the last N lines instead of building a list of every line
+    recent_lines = content.rsplit("\n", lines)[-lines:]
+    content = "\n".join(recent_lines)
+    is_truncated = total_lines is None or total_lines > len(recent_lines)
+    # A character takes at most 4 bytes in UTF-8, so shorter text can skip the encode
+    if len(content) * 4 > max_bytes:
+        encoded, byte_capped = _cap_bytes(content.encode("utf-8"), max_bytes)
+        if byte_capped:
+            content = encoded.decode("utf-8", errors="replace")
+            is_truncated = True
+    return content, total_lines, is_truncated
+
+
+def _tail_offset(f, size, lines):
+    """Return the byte offset at which the last ``lines`` lines of open binary file ``f`` start."""
+    if lines <= 0 or size == 0:
+        return 0
+    f.seek(size - 1)
+    # A final newline ends the last line rather than starting an empty one
+    needed = lines + (f.read(1) == b"\n")
+    offset = size
+    while offset > 0:
+        step = min(_TAIL_BLOCK_SIZE, offset)
+        offset -= step
+        f.seek(offset)
+        block = f.read(step)
+        count = block.count(b"\n")
+        if count >= needed:
+            index = len(block)
+            for _ in range(needed):
+                index = block.rindex(b"\n", 0, index)
+            return offset + index + 1
+        needed -= count
+    return 0
+
+
+def _copy_range(src, dst, offset, count):
+    """Copy ``count`` bytes of ``src`` starting at ``offset`` to ``dst``, in the kernel where possible."""
+    try:
+        while count > 0:
+            sent = os.sendfile(dst.fileno(), src.fileno(), offset, count)
+            if sent == 0:
+                return
+            offset += sent
+            count -= sent
+    except OSError:
+        # sendfile() to a regular file is Linux-only; macOS requires a socket destination
+        pass
+    src.seek(offset)
+    while count > 0:
+        chunk = src.read(min(count, 1024 * 1024))
+        if not chunk:
+            return
+        dst.write(chunk)
+        count -= len(chunk)
 
 
 def collect_file_logs(source):
     """Collect logs from file."""
     file_path = source.get("path")
     lines = source.get("lines", 100)
+    max_bytes = source.get("max_bytes", _MAX_LOG_BYTES)
+    timestamp = datetime.now().isoformat()
 
     try:
-        with open(file_path, "r") as f:
-            content = f.read()
-
-        # Get last N lines
-        all_lines = content.strip().split("\n")
-        recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
+        # Get last N lines without reading all of a large file
+        content, total_lines, is_truncated = _tail(file_path, lines, max_bytes)
 
         return {
-            "content": "\n".join(recent_lines),
-            "total_lines": len(all_lines),
-            "timestamp": datetime.datetime.now().isoformat(),
+            "content": content,
+            "total_lines": total_lines,
+            "is_truncated": is_truncated,
+            "timestamp": timestamp,
         }
     except FileNotFoundError:
-        return {"error": f"File not found: {file_path}", "timestamp": datetime.datetime.now().isoformat()}
+        return {"error": f"File not found: {file_path}", "timestamp": timestamp}
     except Exception as e:
-        return {"error": f"Error reading file: {str(e)}", "timestamp": datetime.datetime.now().isoformat()}
+        return {"error": f"Error reading file: {str(e)}", "timestamp": timestamp}
+
+
+def collect_file_logs_to(path_in, path_out, lines=100):
+    """Copy the last ``lines`` lines of a log file to ``path_out`` verbatim.
+
+    The bytes are never decoded, so this is the cheaper choice when the tail only needs to be
+    saved as an artifact. Returns the number of bytes written.
+    """
+    with open(path_in, "rb") as src, open(path_out, "wb") as dst:
+        size = os.fstat(src.fileno()).st_size
+        start_offset = _tail_offset(src, size, lines)
+        _copy_range(src, dst, start_offset, size - start_offset)
+        return dst.tell()
 
 
 def collect_command_logs(source):
     """Collect logs from command execution."""
     command = source.get("command")
     timeout = source.get("timeout", 30)
+    command_str = shlex.join(command) if isinstance(command, list) else command
+    max_bytes = source.get("max_bytes", _MAX_LOG_BYTES)
+    timestamp = datetime.now().isoformat()
 
     try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=timeout)
+        argv = _command_argv(command)
+        if argv is not None:
+            try:
+                result = subprocess.run(argv, capture_output=True, timeout=timeout)
+            except FileNotFoundError:
+                # Report a missing program as /bin/sh does, so the result looks the same either way
+                result = subprocess.CompletedProcess(argv, 127, b"", f"{argv[0]}: not found\n".encode())
+        else:
+            result = subprocess.run(command, shell=True, capture_output=True, timeout=timeout)
+        stdout, stdout_cut = _cap_bytes(result.stdout, max_bytes)
+        stderr, stderr_cut = _cap_bytes(result.stderr, max_bytes)
         return {
-            "command": " ".join(command) if isinstance(command, list) else command,
-            "stdout": result.stdout,
-            "stderr": result.stderr,
+            "command": command_str,
+            "stdout": _decode(stdout),
+            "stderr": _decode(stderr),
             "return_code": result.returncode,
-            "timestamp": datetime.datetime.now().isoformat(),
+            "is_truncated": stdout_cut or stderr_cut,
+            "timestamp": timestamp,
         }
     except subprocess.TimeoutExpired:
         return {
-            "command": " ".join(command) if isinstance(command, list) else command,
+            "command": command_str,
             "error": f"Command timed out after {timeout} seconds",
-            "timestamp": datetime.datetime.now().isoformat(),
+            "timestamp": timestamp,
         }
     except Exception as e:
         return {
-            "command": " ".join(command) if isinstance(command, list) else command,
+            "command": command_str,
             "error": f"Error executing command: {str(e)}",
-            "timestamp": datetime.datetime.now().isoformat(),
+            "timestamp": timestamp,
         }
 
 
+# Collector for each source type; sources of other types are skipped
+_COLLECTORS = {
+    "container": collect_container_logs,
+    "file": collect_file_logs,
+    "command": collect_command_logs,
+}
+
+
+def _command_argv(command):
+    """Return the argv to run ``command`` without a shell, or None if it needs one.
+
+    Lists are used as-is; plain strings are split with shlex, saving the /bin/sh process.
+    Strings naming a program that is not on PATH keep the shell, so they still report
+    the shell's exit status 127 rather than failing to start.
+    """
+    if isinstance(command, list):
+        return command
+    if _SHELL_SYNTAX.intersection(command):
+        return None
+    argv = shlex.split(command)
+    if not argv or argv[0] in _SHELL_BUILTINS or "=" in argv[0] or shutil.which(argv[0]) is None:
+        return None
+    return argv
+
+
 if __name__ == "__main__":
     # Example usage
     if len(sys.argv) > 1 and sys.argv[1] == "--example":
@@ -107,7 +491,10 @@ if __name__ == "__main__":
             {"type": "container", "name": "macos_container", "container_name": "macos-test-local", "lines": 50},
             {"type": "file", "name": "molecule_log", "path": "/tmp/molecule.log", "lines": 100},
         ]
-        logs = collect_logs(sources)
-        print(json.dumps(logs, indent=2))
+        if "--ndjson" in sys.argv[2:]:
+            collect_logs_stream(sources)
+        else:
+            logs = collect_logs(sources)
+            print(json.dumps(logs, indent=2))
     else:
-        print("Usage: python collect_logs.py --example")
+        print("Usage: python collect_logs.py --example [--ndjson]")